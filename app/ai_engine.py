@@ -4,12 +4,16 @@ Requires GEMINI_API_KEY in .env.
 """
 from __future__ import annotations
 
-import json
+import threading
+import time
+from app.archive import ARCHIVE
 from app.config import settings
+from app.game_context import GameContext, build_prompt, estimate_tokens, state_line
 
 # Lazy init to avoid import-time API key requirement
 _genai = None
 _model = None
+_model_lock = threading.Lock()
 
 
 def _get_model():
@@ -18,64 +22,100 @@ def _get_model():
         return _model
     if not settings.gemini_api_key:
         return None
-    import google.generativeai as genai
-    genai.configure(api_key=settings.gemini_api_key)
-    _genai = genai
-    _model = genai.GenerativeModel(settings.gemini_model)
+    # Warm-up builds the model on a worker thread; don't let a request build a second one.
+    with _model_lock:
+        if _model is not None:
+            return _model
+        import google.generativeai as genai
+        genai.configure(api_key=settings.gemini_api_key)
+        _genai = genai
+        _model = genai.GenerativeModel(settings.gemini_model)
     return _model
 
 
-def _generate(prompt: str, max_tokens: int = 150) -> str:
+def warm_up_model() -> bool:
+    """Import the Gemini SDK and build the model ahead of the first request."""
+    return _get_model() is not None
+
+
+def _generate(prompt: str, max_tokens: int = 150, kind: str | None = None, poll: int = 0) -> str:
+    """Call Gemini; when kind is given the call is written to the post-game archive under poll."""
+    t0 = time.perf_counter()
+    text, usage = _generate_raw(prompt, max_tokens)
+    if kind is not None:
+        ARCHIVE.record_ai(
+            poll=poll,
+            kind=kind,
+            prompt=prompt,
+            response=text,
+            latency_ms=(time.perf_counter() - t0) * 1000,
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            output_tokens=getattr(usage, "candidates_token_count", None),
+            estimated_prompt_tokens=estimate_tokens(prompt),
+        )
+    return text
+
+
+def _generate_raw(prompt: str, max_tokens: int) -> tuple[str, object | None]:
     model = _get_model()
     if not model:
-        return "[Set GEMINI_API_KEY in .env for AI commentary.]"
+        return "[Set GEMINI_API_KEY in .env for AI commentary.]", None
     try:
         response = model.generate_content(
             prompt,
             generation_config={"max_output_tokens": max_tokens, "temperature": 0.7},
         )
         if response and response.text:
-            return response.text.strip()
+            return response.text.strip(), getattr(response, "usage_metadata", None)
     except Exception as e:
         err = str(e)
         if "429" in err or "quota" in err.lower() or "rate" in err.lower():
-            return "[Gemini rate limit — try again in a minute.]"
+            return "[Gemini rate limit — try again in a minute.]", None
         if len(err) > 120:
-            return "[Gemini error. Check API key and quota.]"
-        return f"[Gemini error: {err}]"
-    return "[No response]"
+            return "[Gemini error. Check API key and quota.]", None
+        return f"[Gemini error: {err}]", None
+    return "[No response]", None
 
 
-async def ai_live_commentary(event: dict) -> str:
-    s = event.get("state", {})
-    state_json = json.dumps(s, indent=0)
-    prompt = f"""You are a concise, energetic Super Bowl commentator. In 1-2 short sentences, describe the current game situation. Be specific and vivid. No preamble.
+# Input-token budgets per prompt, at or below the old JSON-dump prompts (~89 / ~32 / ~176);
+# the recap is once per game so it gets room for the full narrative
+COMMENTARY_BUDGET = 85
+WINPROB_BUDGET = 32
+RECAP_BUDGET = 400
 
-Game state (JSON):
-{state_json}
 
-Commentary (1-2 sentences):"""
-    return _generate(prompt, max_tokens=120)
+async def ai_live_commentary(event: dict, context: GameContext | None = None, poll: int = 0) -> str:
+    s = event.get("state", {})
+    prompt = build_prompt(
+        "Energetic Super Bowl commentator. 1-2 short, vivid sentences on the current situation. No preamble.",
+        context.commentary_lines(s) if context else [state_line(s)],
+        "Commentary:",
+        COMMENTARY_BUDGET,
+    )
+    return _generate(prompt, max_tokens=120, kind="commentary", poll=poll)
 
 
-async def ai_winprob_explain(state: dict, wp: float) -> str:
+async def ai_winprob_explain(state: dict, wp: float, context: GameContext | None = None, poll: int = 0) -> str:
     home = state.get("home_team", "Home")
     away = state.get("away_team", "Away")
     leader = home if wp >= 0.5 else away
     pct = int(wp * 100) if wp >= 0.5 else int((1 - wp) * 100)
-    q = state.get("quarter")
-    clock = state.get("clock", "")
-
-    prompt = f"""Super Bowl win-probability explainer. One short sentence only: why {leader} is at ~{pct}% (Q{q}, {clock}). Be specific.
 
-One sentence:"""
-    return _generate(prompt, max_tokens=60)
+    prompt = build_prompt(
+        f"In one sentence, why is {leader} ~{pct}% to win?",
+        context.winprob_lines(state) if context else [state_line(state)],
+        "",
+        WINPROB_BUDGET,
+    )
+    return _generate(prompt, max_tokens=60, kind="winprob", poll=poll)
 
 
 async def ai_postgame_recap(
     final_state: dict,
     winprob_history: list[str],
     player_notes: list[str],
+    context: GameContext | None = None,
+    poll: int = 0,
 ) -> str:
     home = final_state["home_team"]
     away = final_state["away_team"]
@@ -86,13 +126,14 @@ async def ai_postgame_recap(
     winning_score = max(hs, ays)
     losing_score = min(hs, ays)
 
-    context = (
-        f"Final: {winner} {winning_score}, {loser} {losing_score}. "
-        f"Recent win-prob notes: {'; '.join(winprob_history[:5])}."
+    lines = context.recap_lines(final_state) if context else [state_line(final_state)]
+    lines += [f"Note: {n}" for n in winprob_history[:2] + player_notes]
+    prompt = build_prompt(
+        f"Super Bowl recap writer. Final: {winner} {winning_score}, {loser} {losing_score}. "
+        "In 2-3 punchy sentences, recap the game with one memorable angle from the plays below "
+        "(comeback, lead changes, late swing). No bullet points.",
+        lines,
+        "Recap:",
+        RECAP_BUDGET,
     )
-    prompt = f"""You are a Super Bowl recap writer. In 2-3 sentences, write a vivid, punchy recap of the game. Mention the winner and score; add one memorable angle (comeback, MVP moment, etc.). No bullet points.
-
-{context}
-
-Recap (2-3 sentences):"""
-    return _generate(prompt, max_tokens=200)
+    return _generate(prompt, max_tokens=200, kind="recap", poll=poll)
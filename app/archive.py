@@ -0,0 +1,298 @@
+"""
+Per-game columnar archive of every poll and every Gemini call.
+
+Rows are buffered in memory and flushed as Arrow IPC segments under
+runtime/archive/<game>/<table>-<run>-<seq>.arrow, so nothing is lost when MemoryStore
+is trimmed or reset. Recording never touches the disk: callers check flush_due and run
+flush() off the event loop. Run ids are unique per process, so workers sharing the
+archive directory never write the same segment name. Reads go through pyarrow.dataset with memory-mapping and
+predicate pushdown, so a season of games can be filtered/exported without loading
+it all into RAM.
+
+Requires pyarrow (pip install -e ".[archive]"); without it archiving is a no-op and
+the read/export helpers raise ArchiveUnavailable.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.config import settings
+from app.persist import RUNTIME_DIR
+
+ARCHIVE_DIR = RUNTIME_DIR / "archive"
+TABLES = ("polls", "ai_calls")
+FLUSH_EVERY = 50
+
+_pa = None
+
+
+class ArchiveUnavailable(RuntimeError):
+    pass
+
+
+def _arrow():
+    """Lazy pyarrow import (like the Gemini SDK) so the app starts without it."""
+    global _pa
+    if _pa is None:
+        try:
+            import pyarrow
+            import pyarrow.dataset  # noqa: F401
+            import pyarrow.fs  # noqa: F401
+            import pyarrow.ipc  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ArchiveUnavailable('pyarrow not installed: pip install -e ".[archive]"') from e
+        _pa = pyarrow
+    return _pa
+
+
+def _schemas() -> dict:
+    pa = _arrow()
+    common = [
+        ("ts", pa.timestamp("us", tz="UTC")),
+        ("game", pa.string()),
+        ("run_id", pa.string()),
+        ("poll", pa.int32()),
+    ]
+    return {
+        "polls": pa.schema(common + [
+            ("status", pa.string()),
+            ("quarter", pa.int8()),
+            ("clock", pa.string()),
+            ("home_team", pa.string()),
+            ("away_team", pa.string()),
+            ("home_score", pa.int16()),
+            ("away_score", pa.int16()),
+            ("stale", pa.bool_()),
+            ("changed", pa.bool_()),
+            ("winprob_home", pa.float32()),
+            ("plays", pa.list_(pa.string())),
+        ]),
+        "ai_calls": pa.schema(common + [
+            ("kind", pa.string()),
+            ("prompt", pa.string()),
+            ("response", pa.string()),
+            ("latency_ms", pa.float32()),
+            ("prompt_tokens", pa.int32()),
+            ("output_tokens", pa.int32()),
+            ("estimated_prompt_tokens", pa.int32()),
+        ]),
+    }
+
+
+def game_key() -> str:
+    return settings.espn_game_id if not settings.demo_mode and settings.espn_game_id else "demo"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _new_run_id() -> str:
+    # Timestamp for humans; pid + random suffix because several workers can start in the same second
+    return f"{_now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class GameArchive:
+    """Buffers rows per table and appends them to the current game's archive directory."""
+
+    def __init__(self, root: Path = ARCHIVE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._rows: dict[str, list[dict]] = {t: [] for t in TABLES}
+        self._seq = 0
+        self._last_status: str | None = None
+        self._final_pending = False
+        self.run_id = _new_run_id()
+        self.disabled_reason: str | None = None
+
+    def record_poll(self, poll: int, state: dict, changed: bool, winprob_home: float | None, plays: list[str]) -> None:
+        self._append("polls", {
+            "poll": poll,
+            "status": state.get("status"),
+            "quarter": state.get("quarter"),
+            "clock": state.get("clock"),
+            "home_team": state.get("home_team"),
+            "away_team": state.get("away_team"),
+            "home_score": int(state.get("home_score") or 0),
+            "away_score": int(state.get("away_score") or 0),
+            "stale": bool(state.get("stale")),
+            "changed": changed,
+            "winprob_home": winprob_home,
+            "plays": list(plays),
+        })
+        # Flush once when the game goes final, not on every repeat poll of a finished game
+        status = state.get("status")
+        if status == "final" and self._last_status != "final":
+            self._final_pending = True
+        self._last_status = status
+
+    def record_ai(
+        self,
+        poll: int,
+        kind: str,
+        prompt: str,
+        response: str,
+        latency_ms: float,
+        prompt_tokens: int | None,
+        output_tokens: int | None,
+        estimated_prompt_tokens: int,
+    ) -> None:
+        self._append("ai_calls", {
+            "poll": poll,
+            "kind": kind,
+            "prompt": prompt,
+            "response": response,
+            "latency_ms": latency_ms,
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "estimated_prompt_tokens": estimated_prompt_tokens,
+        })
+
+    def _append(self, table: str, row: dict[str, Any]) -> None:
+        if self.disabled_reason:
+            return
+        row = {"ts": _now(), "game": game_key(), "run_id": self.run_id, **row}
+        with self._lock:
+            self._rows[table].append(row)
+
+    @property
+    def flush_due(self) -> bool:
+        """A table buffer is full or the game just went final; the caller should flush (off the loop)."""
+        if self.disabled_reason:
+            return False
+        with self._lock:
+            return self._final_pending or any(len(rows) >= FLUSH_EVERY for rows in self._rows.values())
+
+    def flush(self) -> None:
+        """Write buffered rows as one IPC segment per table. Blocking: call via asyncio.to_thread."""
+        with self._lock:
+            pending = {t: rows for t, rows in self._rows.items() if rows}
+            self._rows = {t: [] for t in TABLES}
+            self._final_pending = False
+            seqs = {}
+            for table in pending:
+                self._seq += 1
+                seqs[table] = self._seq
+        if not pending:
+            return
+        try:
+            pa = _arrow()
+            schemas = _schemas()
+        except ArchiveUnavailable as e:
+            self.disabled_reason = str(e)
+            print(f"Archive disabled: {e}")
+            return
+        try:
+            for table, rows in pending.items():
+                game_dir = self.root / rows[0]["game"]
+                game_dir.mkdir(parents=True, exist_ok=True)
+                path = game_dir / f"{table}-{rows[0]['run_id']}-{seqs[table]:05d}.arrow"
+                batch = pa.RecordBatch.from_pylist(rows, schema=schemas[table])
+                with pa.ipc.new_file(str(path), batch.schema) as writer:
+                    writer.write_batch(batch)
+        except Exception as e:
+            print(f"Error writing archive: {e}")
+
+    def rotate(self) -> None:
+        """Flush and start a new run (e.g. demo reset) so runs stay distinguishable."""
+        self.flush()
+        self.run_id = _new_run_id()
+        self._last_status = None
+
+
+ARCHIVE = GameArchive()
+
+
+# --- Reading / export ---
+
+
+def list_games(root: Path = ARCHIVE_DIR) -> list[str]:
+    if not root.exists():
+        return []
+    return sorted(p.name for p in root.iterdir() if p.is_dir())
+
+
+def _dataset(table: str, games: list[str] | None, root: Path):
+    if table not in TABLES:
+        raise ValueError(f"table must be one of: {', '.join(TABLES)}")
+    pa = _arrow()
+    files = [
+        str(f)
+        for g in (games if games is not None else list_games(root))
+        for f in sorted((root / g).glob(f"{table}-*.arrow"))
+    ]
+    # Memory-mapped IPC files: scans page data in on demand instead of reading it into RAM
+    fs = pa.fs.LocalFileSystem(use_mmap=True)
+    return pa.dataset.dataset(files, schema=_schemas()[table], format="ipc", filesystem=fs)
+
+
+def _filter_expr(filters: dict[str, Any] | None):
+    pa = _arrow()
+    expr = None
+    for col, val in (filters or {}).items():
+        if val is None:
+            continue
+        if col == "since_poll":
+            term = pa.dataset.field("poll") >= val
+        else:
+            term = pa.dataset.field(col) == val
+        expr = term if expr is None else expr & term
+    return expr
+
+
+def scan(
+    table: str,
+    games: list[str] | None = None,
+    columns: list[str] | None = None,
+    filters: dict[str, Any] | None = None,
+    root: Path = ARCHIVE_DIR,
+) -> Iterator:
+    """Stream record batches matching filters (column == value; since_poll = poll >= n)."""
+    ds = _dataset(table, games, root)
+    return ds.to_batches(columns=columns, filter=_filter_expr(filters))
+
+
+def read_table(
+    table: str,
+    games: list[str] | None = None,
+    columns: list[str] | None = None,
+    filters: dict[str, Any] | None = None,
+    root: Path = ARCHIVE_DIR,
+):
+    ds = _dataset(table, games, root)
+    return ds.to_table(columns=columns, filter=_filter_expr(filters))
+
+
+def export(
+    table: str,
+    out_path: Path,
+    fmt: str = "parquet",
+    games: list[str] | None = None,
+    columns: list[str] | None = None,
+    filters: dict[str, Any] | None = None,
+    root: Path = ARCHIVE_DIR,
+) -> int:
+    """Stream matching rows to one Parquet or Arrow IPC file, batch by batch. Returns row count."""
+    pa = _arrow()
+    ds = _dataset(table, games, root)
+    schema = ds.schema if columns is None else pa.schema([ds.schema.field(c) for c in columns])
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(str(out_path), schema)
+    elif fmt == "arrow":
+        writer = pa.ipc.new_file(str(out_path), schema)
+    else:
+        raise ValueError("fmt must be 'parquet' or 'arrow'")
+    rows = 0
+    with writer:
+        for batch in ds.to_batches(columns=columns, filter=_filter_expr(filters)):
+            if batch.num_rows:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
@@ -7,7 +7,21 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 ENV_PATH = PROJECT_ROOT / ".env"
 
 
+_env_loaded = False
+_env_mtime: float | None = None
+
+
 def _load_env() -> None:
+    """Load .env, skipping the parse when the file has not changed since the last load."""
+    global _env_loaded, _env_mtime
+    try:
+        mtime = ENV_PATH.stat().st_mtime
+    except OSError:
+        mtime = None
+    if _env_loaded and mtime == _env_mtime:
+        return
+    _env_loaded = True
+    _env_mtime = mtime
     load_dotenv(ENV_PATH)
 
 
@@ -34,9 +48,33 @@ def get_settings() -> dict:
         "away_team": os.getenv("AWAY_TEAM", "Seahawks") or "Seahawks",
         "gemini_model": os.getenv("GEMINI_MODEL", "gemini-2.0-flash") or "gemini-2.0-flash",
         "espn_game_id": os.getenv("ESPN_GAME_ID") or None,
+        "warmup": os.getenv("WARMUP", "1") == "1",
+        "live_poll_seconds": float(os.getenv("LIVE_POLL_SECONDS", "15") or 15),
     }
 
 
+def update_env_file(values: dict[str, str]) -> None:
+    """Set keys in .env (replacing existing lines, appending new ones) and in this process's env."""
+    lines = ENV_PATH.read_text(encoding="utf-8").splitlines() if ENV_PATH.exists() else []
+    pending = dict(values)
+    out = []
+    for line in lines:
+        key = line.split("=", 1)[0].strip()
+        if not line.lstrip().startswith("#") and "=" in line and key in pending:
+            out.append(f"{key}={_quote(pending.pop(key))}")
+        else:
+            out.append(line)
+    out.extend(f"{k}={_quote(v)}" for k, v in pending.items())
+    ENV_PATH.write_text("\n".join(out) + "\n", encoding="utf-8")
+    # load_dotenv never overrides variables already in os.environ, so set them directly
+    os.environ.update({k: str(v) for k, v in values.items()})
+
+
+def _quote(val: str) -> str:
+    val = str(val)
+    return f'"{val}"' if any(c in val for c in " #'") else val
+
+
 # Load once at import
 _load_env()
 
@@ -45,6 +83,10 @@ class Settings:
     """Simple settings container; values read from env at import and via get_* for key."""
 
     def __init__(self) -> None:
+        self.reload()
+
+    def reload(self) -> None:
+        """Re-read settings from env (e.g. after discovery rewrites .env)."""
         s = get_settings()
         self.demo_mode = s["demo_mode"]
         self.kickoff_iso = s["kickoff_iso"]
@@ -52,6 +94,8 @@ class Settings:
         self.away_team = s["away_team"]
         self.gemini_model = s["gemini_model"]
         self.espn_game_id = s["espn_game_id"]
+        self.warmup = s["warmup"]
+        self.live_poll_seconds = s["live_poll_seconds"]
 
     @property
     def gemini_api_key(self) -> str | None:
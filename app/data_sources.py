@@ -1,17 +1,29 @@
 import json
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
 from pathlib import Path
 import httpx
 from app.game_logic import GameState
 from app.config import settings
+from app.resilience import CircuitBreaker, LatencyTracker, hedged
 
 _project_root = Path(__file__).resolve().parent.parent
 DEMO_PATH = _project_root / "demo_data" / "demo_events.json"
+ESPN_BASE = "https://site.api.espn.com"
 
 
 class DemoFeed:
     def __init__(self):
         self.idx = 0
-        self.events = json.loads(DEMO_PATH.read_text(encoding="utf-8"))
+        self._events: list[dict] | None = None
+
+    @property
+    def events(self) -> list[dict]:
+        # Parsed on first use so importing the app doesn't touch the demo file
+        if self._events is None:
+            self._events = json.loads(DEMO_PATH.read_text(encoding="utf-8"))
+        return self._events
 
     def set_index(self, i: int) -> None:
         try:
@@ -41,80 +53,166 @@ class DemoFeed:
         )
 
 
-_demo = DemoFeed()
+_demo: DemoFeed | None = None
+_client: httpx.AsyncClient | None = None
 
+# Live-feed resilience: last good state is re-served (marked stale) while ESPN is failing
+_breaker = CircuitBreaker()
+_latency = LatencyTracker()
+_last_good: GameState | None = None
+_last_good_iso: str | None = None
+_live_game_id: str | None = None
 
-def demo_get_index() -> int:
-    return _demo.get_index()
 
+def _get_demo() -> DemoFeed:
+    global _demo
+    if _demo is None:
+        _demo = DemoFeed()
+    return _demo
 
-def demo_set_index(i: int) -> None:
-    _demo.set_index(i)
 
+def _get_client() -> httpx.AsyncClient:
+    """Shared ESPN client so polls reuse one pooled connection instead of reconnecting each time."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(base_url=ESPN_BASE, timeout=10.0)
+    return _client
 
-async def fetch_live_espn_state() -> GameState:
-    """Fetch live game data from ESPN NFL API."""
-    if not settings.espn_game_id:
-        return GameState(settings.home_team, settings.away_team)
 
-    url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/summary?event={settings.espn_game_id}"
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
 
-        competitions = data.get("competitions", [])
-        if not competitions:
-            header = data.get("header", {})
-            competitions = header.get("competitions", [])
+def demo_get_index() -> int:
+    return _get_demo().get_index()
 
-        if not competitions:
-            return GameState(settings.home_team, settings.away_team)
 
-        competition = competitions[0]
-        competitors = competition.get("competitors", [])
+def demo_set_index(i: int) -> None:
+    _get_demo().set_index(i)
 
-        home_competitor = next((c for c in competitors if c.get("homeAway") == "home"), {})
-        away_competitor = next((c for c in competitors if c.get("homeAway") == "away"), {})
 
-        home_team = home_competitor.get("team", {}).get("displayName", settings.home_team)
-        away_team = away_competitor.get("team", {}).get("displayName", settings.away_team)
-        home_score = int(home_competitor.get("score", 0))
-        away_score = int(away_competitor.get("score", 0))
+async def warm_up_sources() -> None:
+    """Load the demo feed, or pre-open the ESPN connection in live mode."""
+    if settings.demo_mode:
+        _get_demo().events
+        return
+    # Any response opens the TCP/TLS connection, which the pool then keeps alive
+    await _get_client().head("/")
+
+
+def _parse_espn_summary(data: dict) -> GameState:
+    competitions = data.get("competitions", [])
+    if not competitions:
+        header = data.get("header", {})
+        competitions = header.get("competitions", [])
+
+    if not competitions:
+        raise ValueError("ESPN summary has no competitions")
+
+    competition = competitions[0]
+    competitors = competition.get("competitors", [])
+
+    home_competitor = next((c for c in competitors if c.get("homeAway") == "home"), {})
+    away_competitor = next((c for c in competitors if c.get("homeAway") == "away"), {})
+
+    home_team = home_competitor.get("team", {}).get("displayName", settings.home_team)
+    away_team = away_competitor.get("team", {}).get("displayName", settings.away_team)
+    home_score = int(home_competitor.get("score", 0))
+    away_score = int(away_competitor.get("score", 0))
+
+    status_detail = competition.get("status", {})
+    status_type = status_detail.get("type", {}).get("state", "pre").lower()
+
+    if status_type in ["pre", "scheduled"]:
+        status = "pregame"
+    elif status_type in ["in", "inprogress"]:
+        status = "live"
+    elif status_type in ["post", "final", "complete"]:
+        status = "final"
+    else:
+        status = "pregame"
+
+    period = status_detail.get("period")
+    clock = status_detail.get("displayClock")
+
+    return GameState(
+        home_team=home_team,
+        away_team=away_team,
+        home_score=home_score,
+        away_score=away_score,
+        status=status,
+        quarter=period,
+        clock=clock,
+    )
+
+
+async def _fetch_summary(url: str) -> dict:
+    t0 = time.monotonic()
+    resp = await _get_client().get(url)
+    resp.raise_for_status()
+    data = resp.json()
+    _latency.record(time.monotonic() - t0)
+    return data
+
+
+def _stale_state() -> GameState:
+    if _last_good is None:
+        return GameState(settings.home_team, settings.away_team, stale=True)
+    return replace(_last_good, stale=True)
+
+
+def reset_live_state() -> None:
+    """Drop the last-good state, breaker and latency history (they belong to the previous game)."""
+    global _breaker, _latency, _last_good, _last_good_iso
+    _breaker = CircuitBreaker()
+    _latency = LatencyTracker()
+    _last_good = None
+    _last_good_iso = None
+
+
+def upstream_status() -> dict:
+    p95 = _latency.p95()
+    return {
+        "breaker": _breaker.to_dict(),
+        "p95_ms": round(p95 * 1000) if p95 is not None else None,
+        "last_good_iso": _last_good_iso,
+    }
 
-        status_detail = competition.get("status", {})
-        status_type = status_detail.get("type", {}).get("state", "pre").lower()
 
-        if status_type in ["pre", "scheduled"]:
-            status = "pregame"
-        elif status_type in ["in", "inprogress"]:
-            status = "live"
-        elif status_type in ["post", "final", "complete"]:
-            status = "final"
-        else:
-            status = "pregame"
+async def fetch_live_espn_state() -> GameState:
+    """Fetch live game data from ESPN NFL API; on failure, re-serve the last good state marked stale."""
+    global _last_good, _last_good_iso, _live_game_id
+    if not settings.espn_game_id:
+        return GameState(settings.home_team, settings.away_team)
+    if settings.espn_game_id != _live_game_id:
+        # Never re-serve another game's score as this game's stale state
+        reset_live_state()
+        _live_game_id = settings.espn_game_id
 
-        period = status_detail.get("period")
-        clock = status_detail.get("displayClock")
+    if not _breaker.allow():
+        return _stale_state()
 
-        return GameState(
-            home_team=home_team,
-            away_team=away_team,
-            home_score=home_score,
-            away_score=away_score,
-            status=status,
-            quarter=period,
-            clock=clock,
-        )
+    url = f"/apis/site/v2/sports/football/nfl/summary?event={settings.espn_game_id}"
 
+    try:
+        # Duplicate the request if it runs past p95 so one slow upstream response doesn't stall the poll
+        data = await hedged(lambda: _fetch_summary(url), _latency.hedge_after())
+        state = _parse_espn_summary(data)
     except Exception as e:
         print(f"Error fetching NFL data from ESPN: {e}")
-        return GameState(settings.home_team, settings.away_team)
+        _breaker.record_failure(str(e))
+        return _stale_state()
+
+    _breaker.record_success()
+    _last_good = state
+    _last_good_iso = datetime.now(timezone.utc).isoformat()
+    return state
 
 
 async def fetch_state() -> GameState:
     if settings.demo_mode:
-        return _demo.next_state()
+        return _get_demo().next_state()
     return await fetch_live_espn_state()
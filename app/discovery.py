@@ -0,0 +1,274 @@
+"""
+ESPN NFL game discovery: fetch scoreboard pages concurrently (by date or season week),
+cache raw responses on disk, index games by team/date/name, pick the Super Bowl or a
+named matchup, and write the tracker's .env settings for it.
+
+Used by find_super_bowl.py; pollers can call discover() / select_game() directly.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+from app.archive import ARCHIVE
+from app.config import settings, update_env_file
+from app.data_sources import reset_live_state
+from app.persist import RUNTIME_DIR
+from app.store import STORE
+
+SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+CACHE_DIR = RUNTIME_DIR / "espn_cache"
+SUPER_BOWL_SEASON_TYPE = 3  # postseason
+SUPER_BOWL_WEEK = 5
+
+# A page pinned by explicit `dates` with every game finished never changes and is kept;
+# anything else (live games, or "current" queries like {} or season/week without a year) expires
+CACHE_TTL_LIVE = 60.0
+MAX_CONCURRENCY = 6
+
+
+@dataclass
+class GameInfo:
+    id: str
+    name: str
+    short_name: str
+    date_iso: str
+    home_team: str
+    away_team: str
+    home_score: str
+    away_score: str
+    state: str  # pre | in | post
+    status_detail: str
+    period: int | None
+    clock: str
+    season_type: int | None
+    week: int | None
+    headline: str
+
+    @property
+    def is_super_bowl(self) -> bool:
+        text = f"{self.name} {self.short_name} {self.headline}".lower()
+        if "super bowl" in text:
+            return True
+        return self.season_type == SUPER_BOWL_SEASON_TYPE and self.week == SUPER_BOWL_WEEK
+
+    @property
+    def day(self) -> str:
+        return self.date_iso[:10]
+
+    def env_values(self) -> dict[str, str]:
+        """Settings that point the tracker at this game (see config.py)."""
+        return {
+            "DEMO_MODE": "0",
+            "ESPN_GAME_ID": self.id,
+            "HOME_TEAM": self.home_team,
+            "AWAY_TEAM": self.away_team,
+            "KICKOFF_ISO": self.date_iso,
+        }
+
+
+def _parse_event(event: dict, page: dict) -> GameInfo:
+    comp = (event.get("competitions") or [{}])[0]
+    competitors = comp.get("competitors", [])
+    home = next((c for c in competitors if c.get("homeAway") == "home"), {})
+    away = next((c for c in competitors if c.get("homeAway") == "away"), {})
+    status = event.get("status", {})
+    notes = comp.get("notes") or []
+    season = event.get("season") or page.get("season") or {}
+    week = event.get("week") or page.get("week") or {}
+    kickoff = event.get("date", "")
+    # ESPN dates look like 2026-02-08T23:30Z; normalise so datetime.fromisoformat accepts them
+    if kickoff.endswith("Z"):
+        kickoff = kickoff[:-1] + "+00:00"
+    return GameInfo(
+        id=str(event.get("id", "")),
+        name=event.get("name", "Unknown"),
+        short_name=event.get("shortName", ""),
+        date_iso=kickoff,
+        home_team=home.get("team", {}).get("displayName", "?"),
+        away_team=away.get("team", {}).get("displayName", "?"),
+        home_score=str(home.get("score", "0")),
+        away_score=str(away.get("score", "0")),
+        state=status.get("type", {}).get("state", "pre"),
+        status_detail=status.get("type", {}).get("detail", "Scheduled"),
+        period=status.get("period"),
+        clock=status.get("displayClock", ""),
+        season_type=season.get("type"),
+        week=week.get("number"),
+        headline=(notes[0].get("headline", "") if notes else ""),
+    )
+
+
+class GameIndex:
+    """Games keyed by ESPN id, with lookups by team, day and name."""
+
+    def __init__(self, games: list[GameInfo] | None = None):
+        self.games: dict[str, GameInfo] = {}
+        for g in games or []:
+            self.add(g)
+
+    def add(self, game: GameInfo) -> None:
+        self.games[game.id] = game
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def all(self) -> list[GameInfo]:
+        return sorted(self.games.values(), key=lambda g: (g.date_iso, g.id))
+
+    def by_team(self, team: str) -> list[GameInfo]:
+        t = team.strip().lower()
+        return [g for g in self.all() if t in g.home_team.lower() or t in g.away_team.lower()]
+
+    def by_day(self, day: str) -> list[GameInfo]:
+        return [g for g in self.all() if g.day == day]
+
+    def by_name(self, text: str) -> list[GameInfo]:
+        t = text.strip().lower()
+        return [g for g in self.all() if t in f"{g.name} {g.short_name} {g.headline}".lower()]
+
+    def super_bowl(self) -> GameInfo | None:
+        games = [g for g in self.all() if g.is_super_bowl]
+        return games[-1] if games else None
+
+    def matchup(self, team_a: str, team_b: str) -> GameInfo | None:
+        b = team_b.strip().lower()
+        games = [g for g in self.by_team(team_a) if b in g.home_team.lower() or b in g.away_team.lower()]
+        return games[-1] if games else None
+
+
+def _cache_path(params: dict) -> Path:
+    key = hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"scoreboard-{key}.json"
+
+
+def _read_cache(params: dict) -> dict | None:
+    path = _cache_path(params)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not entry.get("final") and time.time() - entry.get("fetched_at", 0) > CACHE_TTL_LIVE:
+        return None
+    return entry.get("data")
+
+
+def _write_cache(params: dict, data: dict) -> None:
+    events = data.get("events", [])
+    final = "dates" in params and bool(events) and all(
+        e.get("status", {}).get("type", {}).get("state") == "post" for e in events
+    )
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_path(params).write_text(
+            json.dumps({"fetched_at": time.time(), "final": final, "data": data}),
+            encoding="utf-8",
+        )
+    except Exception:
+        pass
+
+
+async def _fetch_page(client: httpx.AsyncClient, sem: asyncio.Semaphore, params: dict, use_cache: bool) -> dict:
+    if use_cache:
+        cached = _read_cache(params)
+        if cached is not None:
+            return cached
+    async with sem:
+        resp = await client.get(SCOREBOARD_URL, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+    if use_cache:
+        _write_cache(params, data)
+    return data
+
+
+def date_params(start: date, end: date) -> list[dict]:
+    """One scoreboard query per day in [start, end]."""
+    days = (end - start).days
+    return [{"dates": (start + timedelta(days=i)).strftime("%Y%m%d")} for i in range(max(0, days) + 1)]
+
+
+def week_params(season_type: int, weeks: list[int], year: int | None = None) -> list[dict]:
+    params = []
+    for w in weeks:
+        p = {"seasontype": season_type, "week": w}
+        if year is not None:
+            p["dates"] = year
+        params.append(p)
+    return params
+
+
+async def discover(
+    queries: list[dict],
+    use_cache: bool = True,
+    client: httpx.AsyncClient | None = None,
+) -> tuple[GameIndex, list[str]]:
+    """Fetch every scoreboard query concurrently and index the games. Returns (index, errors)."""
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    own_client = client is None
+    client = client or httpx.AsyncClient(timeout=10.0)
+    try:
+        results = await asyncio.gather(
+            *(_fetch_page(client, sem, q, use_cache) for q in queries),
+            return_exceptions=True,
+        )
+    finally:
+        if own_client:
+            await client.aclose()
+
+    index = GameIndex()
+    errors = []
+    for q, res in zip(queries, results):
+        if isinstance(res, Exception):
+            errors.append(f"{q}: {res}")
+            continue
+        for event in res.get("events", []):
+            index.add(_parse_event(event, res))
+    return index, errors
+
+
+def default_queries(today: date | None = None) -> list[dict]:
+    """Current scoreboard, the past/next week by date, and the postseason (Super Bowl) week."""
+    today = today or datetime.now().date()
+    return (
+        [{}]
+        + date_params(today - timedelta(days=7), today + timedelta(days=7))
+        + week_params(SUPER_BOWL_SEASON_TYPE, [SUPER_BOWL_WEEK])
+    )
+
+
+def select_game(index: GameIndex, matchup: str | None = None) -> GameInfo | None:
+    """A 'Team A vs Team B' (or 'Team A @ Team B', or a single team) matchup, else the Super Bowl."""
+    if matchup:
+        for sep in (" vs ", " @ ", " at ", ","):
+            if sep in matchup.lower():
+                i = matchup.lower().index(sep)
+                return index.matchup(matchup[:i], matchup[i + len(sep):])
+        games = index.by_team(matchup) or index.by_name(matchup)
+        return games[-1] if games else None
+    return index.super_bowl()
+
+
+def configure_tracker(game: GameInfo) -> dict[str, str]:
+    """
+    Point the tracker at game: rewrite .env, refresh the in-process settings and, if the
+    game changed, drop everything that belonged to the previous one (store, prompt context,
+    last-good ESPN state, breaker) and start a new archive run. The server's live poll loop
+    re-reads settings each round, so it picks the new game up without a restart.
+    """
+    previous = settings.espn_game_id if not settings.demo_mode else None
+    values = game.env_values()
+    update_env_file(values)
+    settings.reload()
+    if game.id != previous:
+        ARCHIVE.rotate()
+        reset_live_state()
+        STORE.reset()
+    return values
@@ -0,0 +1,204 @@
+"""
+Rolling game narrative for Gemini prompts.
+GameContext is updated once per changed poll (key plays, lead changes, momentum, win-prob
+swings) so each prompt kind can take only the slice it needs: win-prob gets the score line
+and the last swing, commentary the last few plays, and only the recap the full narrative.
+build_prompt() puts the fixed instructions first and fits context lines to a token budget.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+MAX_KEY_PLAYS = 40
+COMMENTARY_PLAYS = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars/token) — good enough for budgeting without a tokenizer."""
+    return (len(text) + 3) // 4
+
+
+def _score_desc(points: int) -> str:
+    """What a score change between two polls was, when a single play explains it."""
+    if points in (6, 7, 8):
+        return "TD"
+    if points == 3:
+        return "FG"
+    if points == 2:
+        return "safety/2pt"
+    if points == 1:
+        return "PAT"
+    # Several scores landed between polls; don't invent plays we didn't see
+    return f"+{points} (multiple scores)"
+
+
+def _clock(state: dict) -> str:
+    q = state.get("quarter")
+    if q is None:
+        return ""
+    return f"Q{q} {state.get('clock') or ''}".strip()
+
+
+def state_line(state: dict) -> str:
+    """One-line scoreboard, e.g. 'Seahawks 7 @ Patriots 14 | Q3 05:30 | live'."""
+    parts = [
+        f"{state.get('away_team', 'Away')} {state.get('away_score', 0) or 0} @ "
+        f"{state.get('home_team', 'Home')} {state.get('home_score', 0) or 0}"
+    ]
+    clock = _clock(state)
+    if clock:
+        parts.append(clock)
+    parts.append(state.get("status") or "pregame")
+    return " | ".join(parts)
+
+
+@dataclass
+class GameContext:
+    key_plays: list[str] = field(default_factory=list)
+    lead_changes: int = 0
+    ties: int = 0
+    largest_lead: dict[str, int] = field(default_factory=dict)
+    run_team: str | None = None
+    run_points: int = 0
+    biggest_wp_swing: tuple[float, str] | None = None
+    last_wp_swing: str | None = None
+
+    # Previous-poll bookkeeping for diffing; not part of the summary
+    _last_state: dict | None = field(default=None, init=False, repr=False, compare=False)
+    _last_leader: str | None = field(default=None, init=False, repr=False, compare=False)
+    _last_wp: float | None = field(default=None, init=False, repr=False, compare=False)
+    _plays_added: int = field(default=0, init=False, repr=False, compare=False)
+
+    def reset(self) -> None:
+        self.key_plays.clear()
+        self.lead_changes = 0
+        self.ties = 0
+        self.largest_lead.clear()
+        self.run_team = None
+        self.run_points = 0
+        self.biggest_wp_swing = None
+        self.last_wp_swing = None
+        self._last_state = None
+        self._last_leader = None
+        self._last_wp = None
+        self._plays_added = 0
+
+    def update(self, state: dict, wp: float | None = None) -> list[str]:
+        """
+        Fold one changed poll into the summary; only diffs against the previous poll are examined.
+        Returns the key plays this poll added (at most one per poll).
+        The first poll (after a restart, reset or mid-game join) is only the baseline: the
+        scoring before it wasn't observed, so no play is invented for it.
+        """
+        home, away = state.get("home_team", "Home"), state.get("away_team", "Away")
+        hs, ays = int(state.get("home_score") or 0), int(state.get("away_score") or 0)
+        if self._last_state is None:
+            self._last_state = dict(state)
+            self._last_leader = home if hs > ays else away if ays > hs else None
+            if wp is not None:
+                self._last_wp = wp
+            return []
+        added_before = self._plays_added
+        prev = self._last_state
+        phs, pays = int(prev.get("home_score") or 0), int(prev.get("away_score") or 0)
+        when = _clock(state)
+
+        scored = [(team, delta) for team, delta in ((home, hs - phs), (away, ays - pays)) if delta > 0]
+        if len(scored) == 1:
+            team, delta = scored[0]
+            if self.run_team == team:
+                self.run_points += delta
+            else:
+                self.run_team, self.run_points = team, delta
+        elif scored:
+            # Both teams scored between polls: order unknown, so no run to report
+            self.run_team, self.run_points = None, 0
+
+        lead_note = ""
+        leader = home if hs > ays else away if ays > hs else None
+        if scored:
+            if leader is None:
+                self.ties += 1
+                lead_note = ", tied"
+            elif self._last_leader is not None and leader != self._last_leader:
+                self.lead_changes += 1
+                lead_note = f", {leader} take the lead"
+            if leader is not None:
+                self._last_leader = leader
+                margin = abs(hs - ays)
+                self.largest_lead[leader] = max(self.largest_lead.get(leader, 0), margin)
+
+        final = state.get("status") == "final" and prev.get("status") != "final"
+        if scored:
+            what = ", ".join(f"{team} {_score_desc(delta)}" for team, delta in scored)
+            tag = "Final" if final else when
+            self._add_play(f"{tag}: {what} (now {away} {ays}-{home} {hs}{lead_note})")
+        elif final:
+            self._add_play(f"Final: {away} {ays}-{home} {hs}")
+
+        if wp is not None and self._last_wp is not None:
+            delta_wp = wp - self._last_wp
+            if abs(delta_wp) >= 0.01:
+                gainer = home if delta_wp > 0 else away
+                self.last_wp_swing = f"{gainer} +{int(round(abs(delta_wp) * 100))}"
+            if self.biggest_wp_swing is None or abs(delta_wp) > self.biggest_wp_swing[0]:
+                self.biggest_wp_swing = (abs(delta_wp), when)
+        if wp is not None:
+            self._last_wp = wp
+        self._last_state = dict(state)
+        new = self._plays_added - added_before
+        return self.key_plays[-new:] if new else []
+
+    def _add_play(self, text: str) -> None:
+        self._plays_added += 1
+        self.key_plays.append(text)
+        del self.key_plays[:-MAX_KEY_PLAYS]
+
+    # --- Per-prompt-kind context, most important line first ---
+
+    def winprob_lines(self, state: dict) -> list[str]:
+        lines = [state_line(state)]
+        if self.last_wp_swing:
+            lines.append(f"Swing: {self.last_wp_swing}")
+        return lines
+
+    def commentary_lines(self, state: dict) -> list[str]:
+        lines = [state_line(state)]
+        lines += [f"Recent: {p}" for p in reversed(self.key_plays[-COMMENTARY_PLAYS:])]
+        if self.run_team and self.run_points >= 10:
+            lines.append(f"Momentum: {self.run_team} on a {self.run_points}-0 run")
+        return lines
+
+    def recap_lines(self, state: dict) -> list[str]:
+        """Full narrative: aggregates first, then key plays newest first (trimmed oldest-first by budget)."""
+        lines = [state_line(state)]
+        if self.lead_changes or self.ties:
+            lines.append(f"Lead changes: {self.lead_changes}; ties: {self.ties}")
+        if self.largest_lead:
+            lines.append("Largest lead: " + ", ".join(f"{t} {m}" for t, m in self.largest_lead.items()))
+        if self.biggest_wp_swing and self.biggest_wp_swing[0] >= 0.05:
+            swing, when = self.biggest_wp_swing
+            lines.append(f"Biggest win-prob swing: {int(swing * 100)} pts ({when})")
+        lines += [f"Play: {p}" for p in reversed(self.key_plays)]
+        return lines
+
+
+def build_prompt(instructions: str, context_lines: list[str], cue: str, budget_tokens: int) -> str:
+    """
+    Fixed instructions, then as many context lines as fit in budget_tokens (in the given
+    priority order, re-sorted chronologically for 'Play:'/'Recent:' lines), then the answer cue
+    if one is given.
+    The instructions and cue are always kept even if they alone exceed the budget.
+    """
+    used = estimate_tokens(instructions) + (estimate_tokens(cue) + 1 if cue else 0)
+    kept: list[str] = []
+    for line in context_lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget_tokens:
+            break
+        kept.append(line)
+        used += cost
+    is_play = [line.startswith(("Play: ", "Recent: ")) for line in kept]
+    head = [line for line, play in zip(kept, is_play) if not play]
+    plays = [line for line, play in zip(kept, is_play) if play]
+    return "\n".join([instructions, *head, *reversed(plays)] + ([cue] if cue else []))
@@ -13,6 +13,7 @@ class GameState:
     status: str = "pregame"  # pregame | live | final
     quarter: int | None = None
     clock: str | None = None
+    stale: bool = False  # last-good state re-served while the upstream is failing
 
     def to_dict(self) -> dict:
         return {
@@ -23,6 +24,7 @@ class GameState:
             "status": self.status,
             "quarter": self.quarter,
             "clock": self.clock,
+            "stale": self.stale,
         }
 
 
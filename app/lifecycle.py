@@ -0,0 +1,91 @@
+"""
+Startup/shutdown lifecycle: readiness flags and the optional background warm-up.
+Nothing here runs at import; main.py drives it from the FastAPI startup/shutdown hooks.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from app.ai_engine import warm_up_model
+from app.archive import ARCHIVE
+from app.config import settings
+from app.data_sources import close_client, warm_up_sources
+
+
+@dataclass
+class Readiness:
+    hydrated: bool = False
+    warmed_up: bool = False
+    warmup_errors: list[str] = field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        return self.hydrated and self.warmed_up
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "hydrated": self.hydrated,
+            "warmed_up": self.warmed_up,
+            "warmup_errors": list(self.warmup_errors),
+        }
+
+
+READINESS = Readiness()
+
+_warmup_task: asyncio.Task | None = None
+_poller_task: asyncio.Task | None = None
+
+
+async def warm_up() -> None:
+    """Pay one-off costs (SDK import, model build, ESPN connection) before the first request does."""
+    try:
+        # SDK import and model construction are blocking; keep them off the event loop
+        await asyncio.to_thread(warm_up_model)
+    except Exception as e:
+        READINESS.warmup_errors.append(f"gemini: {e}")
+    try:
+        await warm_up_sources()
+    except Exception as e:
+        READINESS.warmup_errors.append(f"sources: {e}")
+    # Failures only cost latency later (the lazy paths retry), so they don't block readiness
+    READINESS.warmed_up = True
+
+
+def start_warm_up(enabled: bool) -> None:
+    global _warmup_task
+    if not enabled:
+        READINESS.warmed_up = True
+        return
+    _warmup_task = asyncio.create_task(warm_up())
+
+
+async def _poll_loop(poll: Callable[[], Awaitable[None]]) -> None:
+    # Settings are re-read every round so a game configured in-process (discovery) is picked up
+    while True:
+        if not settings.demo_mode and settings.espn_game_id:
+            try:
+                await poll()
+            except Exception as e:
+                print(f"Error in live poll loop: {e}")
+        await asyncio.sleep(settings.live_poll_seconds)
+
+
+def start_live_poller(poll: Callable[[], Awaitable[None]]) -> None:
+    """One server-side ESPN poll loop per worker, instead of a POST /admin/poll timer in every open tab."""
+    global _poller_task
+    if _poller_task is None or _poller_task.done():
+        _poller_task = asyncio.create_task(_poll_loop(poll))
+
+
+async def shutdown() -> None:
+    global _warmup_task, _poller_task
+    for task in (_warmup_task, _poller_task):
+        if task is not None and not task.done():
+            task.cancel()
+    _warmup_task = None
+    _poller_task = None
+    await asyncio.to_thread(ARCHIVE.flush)
+    await close_client()
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import tempfile
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
 
 from app.config import settings
 
 # Project root: same folder as app/ and .env (works no matter where uvicorn is run from)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
-from app.data_sources import fetch_state, demo_get_index, demo_set_index
+from app.data_sources import fetch_state, demo_get_index, demo_set_index, upstream_status
 from app.game_logic import (
     fingerprint,
     kickoff_countdown,
@@ -27,6 +32,8 @@ from app.ai_engine import (
 )
 from app.persist import load_state, save_state
 from app.assets import team_logo_url
+from app.archive import ARCHIVE, ArchiveUnavailable, TABLES, export as archive_export, list_games
+from app.lifecycle import READINESS, start_live_poller, start_warm_up, shutdown as lifecycle_shutdown
 
 app = FastAPI(title="Super Bowl AI Tracker")
 app.mount("/static", StaticFiles(directory=str(PROJECT_ROOT / "app" / "static")), name="static")
@@ -34,7 +41,7 @@ templates = Jinja2Templates(directory=str(PROJECT_ROOT / "app" / "templates"))
 
 
 @app.on_event("startup")
-def startup():
+async def startup():
     import logging
     # Reduce terminal spam from /api/state and /api/settings (called every few seconds)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -42,6 +49,15 @@ def startup():
         print("Gemini API key loaded. AI commentary enabled.")
     else:
         print("WARNING: GEMINI_API_KEY not set. Put your key in .env in the project root. AI will show placeholder text.")
+    _hydrate_from_disk()
+    READINESS.hydrated = True
+    start_warm_up(settings.warmup)
+    start_live_poller(poll_once)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await lifecycle_shutdown()
 
 
 def _now_iso() -> str:
@@ -54,6 +70,18 @@ def _norm(s: str) -> str:
 
 RATE_LIMIT_MSG = "rate limit"
 
+# Distinguishes versions across restarts (STORE.version starts at 0 in every process)
+BOOT_ID = uuid.uuid4().hex[:8]
+_poll_lock = asyncio.Lock()
+
+
+def _state_version() -> str:
+    return f"{BOOT_ID}-{STORE.version}"
+
+
+def _bump_version() -> None:
+    STORE.version += 1
+
 def _dedupe_insert(buf: list[str], text: str, max_items: int = 50) -> None:
     t = (text or "").strip()
     if not t or RATE_LIMIT_MSG in t.lower():
@@ -84,11 +112,24 @@ def _default_state() -> dict:
         "status": "pregame",
         "quarter": None,
         "clock": None,
+        "stale": False,
         "phase": "PREGAME",
     }
 
 
-def _payload() -> dict:
+def _status() -> dict:
+    """Per-poll counters and upstream health; they change on every poll, so they stay out of the ETag'd state."""
+    return {
+        "poll_count": STORE.poll_count,
+        "last_update_iso": STORE.last_update_iso,
+        "version": _state_version(),
+        "demo_idx": demo_get_index() if settings.demo_mode else None,
+        "upstream": upstream_status() if not settings.demo_mode else None,
+    }
+
+
+def _payload(volatile: bool = True) -> dict:
+    """Full page state. With volatile=False the _status() fields are left out, so the body only changes with the version."""
     raw = STORE.last_state or _default_state()
     state = {
         **raw,
@@ -97,20 +138,22 @@ def _payload() -> dict:
         "phase": raw.get("phase") or ("FINAL" if raw.get("status") == "final" else "LIVE" if raw.get("status") == "live" else "PREGAME"),
     }
     assets = _asset_payload(state)
+    meta = {
+        "version": _state_version(),
+        "demo_mode": settings.demo_mode,
+        "live_mode": not settings.demo_mode,
+        "espn_game_id_set": bool(settings.espn_game_id),
+        "stale": bool(state.get("stale")),
+    }
+    if volatile:
+        meta.update(_status())
     return {
         "state": state,
         "commentary": STORE.commentary[:20],
         "winprob_home": STORE.winprob_home,
         "winprob_history": STORE.winprob_history[:20],
         "postgame_recap": STORE.postgame_recap,
-        "meta": {
-            "poll_count": STORE.poll_count,
-            "last_update_iso": STORE.last_update_iso,
-            "demo_mode": settings.demo_mode,
-            "live_mode": not settings.demo_mode,
-            "espn_game_id_set": bool(settings.espn_game_id),
-            "demo_idx": demo_get_index() if settings.demo_mode else None,
-        },
+        "meta": meta,
         **assets,
     }
 
@@ -132,39 +175,46 @@ def _hydrate_from_disk() -> None:
     if settings.demo_mode and meta.get("demo_idx") is not None:
         demo_set_index(meta.get("demo_idx"))
 
-    STORE.last_fingerprint = None
-    STORE.commentary.clear()
-    STORE.winprob_history.clear()
-    STORE.winprob_home = None
-    STORE.postgame_recap = None
-    STORE.last_state = None
-    STORE.poll_count = 0
-    STORE.last_update_iso = None
+    STORE.reset()
 
 
-_hydrate_from_disk()
+async def poll_once() -> None:
+    # Background live loop and /admin/poll can overlap; one poll at a time keeps fingerprints consistent
+    async with _poll_lock:
+        await _poll_once()
+        # Recording only buffers; segment writes (and the first pyarrow import) stay off the loop
+        if ARCHIVE.flush_due:
+            await asyncio.to_thread(ARCHIVE.flush)
 
 
-async def poll_once() -> None:
+async def _poll_once() -> None:
     state_obj = await fetch_state()
     state = state_obj.to_dict()
     state["phase"] = game_phase(state_obj)
+    state_changed = state != STORE.last_state
     STORE.last_state = state
 
     fp = fingerprint(state_obj)
     STORE.poll_count += 1
     STORE.last_update_iso = _now_iso()
 
-    if STORE.last_fingerprint == fp:
+    # Stale = upstream is failing and we're re-serving the last good state; never feed it to Gemini
+    if state_obj.stale or STORE.last_fingerprint == fp:
+        ARCHIVE.record_poll(STORE.poll_count, state, False, STORE.winprob_home, [])
+        # Only clock/stale can differ here; bump just for that so idle polls still get 304s
+        if state_changed:
+            _bump_version()
         _persist()
         return
     STORE.last_fingerprint = fp
 
-    _dedupe_insert(STORE.commentary, await ai_live_commentary({"state": state}))
-
     wp = compute_win_prob_simple(state_obj)
+    plays = STORE.context.update(state, wp)
+
+    _dedupe_insert(STORE.commentary, await ai_live_commentary({"state": state}, STORE.context, STORE.poll_count))
+
     STORE.winprob_home = wp
-    expl = await ai_winprob_explain(state, wp)
+    expl = await ai_winprob_explain(state, wp, STORE.context, STORE.poll_count)
     leader = state["home_team"] if wp >= 0.5 else state["away_team"]
     pct = int(wp * 100) if wp >= 0.5 else int((1 - wp) * 100)
     _dedupe_insert(STORE.winprob_history, f"{leader} {pct}% — {expl}")
@@ -174,8 +224,12 @@ async def poll_once() -> None:
             state,
             STORE.winprob_history[:10],
             [],
+            STORE.context,
+            STORE.poll_count,
         )
 
+    ARCHIVE.record_poll(STORE.poll_count, state, True, wp, plays)
+    _bump_version()
     _persist()
 
 
@@ -210,13 +264,9 @@ async def admin_demo_reset():
     if not settings.demo_mode:
         return JSONResponse({"ok": True, "message": "Not in demo mode"}, status_code=200)
     demo_set_index(0)
-    STORE.last_fingerprint = None
-    STORE.commentary.clear()
-    STORE.winprob_history.clear()
-    STORE.winprob_home = None
-    STORE.postgame_recap = None
+    await asyncio.to_thread(ARCHIVE.rotate)
+    STORE.reset()
     STORE.last_state = _default_state()
-    STORE.poll_count = 0
     STORE.last_update_iso = _now_iso()
     _persist()
     return JSONResponse({"ok": True, **_payload()})
@@ -229,8 +279,19 @@ async def admin_poll():
 
 
 @app.get("/api/state")
-async def api_state():
-    return JSONResponse(_payload())
+async def api_state(request: Request):
+    """Versioned payload, or 304 when If-None-Match matches the current state version."""
+    etag = f'"{_state_version()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(_payload(volatile=False), headers=headers)
+
+
+@app.get("/api/status")
+async def api_status():
+    """Poll counters and upstream health (never cached)."""
+    return JSONResponse(_status(), headers={"Cache-Control": "no-store"})
 
 
 @app.post("/admin/clear/{panel}")
@@ -255,10 +316,69 @@ async def clear_panel(panel: str):
         )
 
     STORE.last_update_iso = _now_iso()
+    _bump_version()
     _persist()
     return JSONResponse({"ok": True, **_payload()})
 
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving."""
+    return JSONResponse({"ok": True})
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: state hydrated and warm-up finished, so the first poll won't pay cold-start costs."""
+    return JSONResponse(READINESS.to_dict(), status_code=200 if READINESS.ready else 503)
+
+
+@app.get("/api/archive")
+async def api_archive():
+    """Archived games (one directory per ESPN game id, or 'demo')."""
+    # Flushing writes IPC files; keep the disk I/O off the event loop
+    await asyncio.to_thread(ARCHIVE.flush)
+    return JSONResponse({"games": list_games(ARCHIVE.root), "tables": list(TABLES), "disabled": ARCHIVE.disabled_reason})
+
+
+@app.get("/api/archive/export")
+async def api_archive_export(
+    table: str = "polls",
+    fmt: str = "parquet",
+    game: str | None = None,
+    status: str | None = None,
+    quarter: int | None = None,
+    kind: str | None = None,
+    since_poll: int | None = None,
+):
+    """Bulk export one table (all games, or ?game=) as a Parquet or Arrow IPC file, with simple filters."""
+    await asyncio.to_thread(ARCHIVE.flush)
+    if table == "ai_calls":
+        filters = {"kind": kind, "since_poll": since_poll}
+    else:
+        filters = {"status": status, "quarter": quarter, "since_poll": since_poll}
+    suffix = ".parquet" if fmt == "parquet" else ".arrow"
+    fd, name = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)  # the exporter reopens the path itself
+    out = Path(name)
+    try:
+        await asyncio.to_thread(
+            archive_export, table, out, fmt, [game] if game else None, None, filters, ARCHIVE.root,
+        )
+    except ArchiveUnavailable as e:
+        out.unlink(missing_ok=True)
+        raise HTTPException(status_code=501, detail=str(e))
+    except ValueError as e:
+        out.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail=str(e))
+    return FileResponse(
+        out,
+        filename=f"{game or 'all'}-{table}{suffix}",
+        media_type="application/octet-stream",
+        background=BackgroundTask(out.unlink, missing_ok=True),
+    )
+
+
 @app.get("/api/settings")
 async def api_settings():
     return JSONResponse({
@@ -0,0 +1,135 @@
+"""
+Upstream resilience helpers for the ESPN feed: circuit breaker, latency tracking, hedged requests.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after N consecutive failures; half-open after a cooldown that doubles per trip.
+    Half-open admits one probe at a time; a probe that never reports back (e.g. cancelled)
+    is abandoned after probe_timeout so the breaker can't wedge.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_cooldown: float = 5.0,
+        max_cooldown: float = 120.0,
+        probe_timeout: float = 30.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self.failures = 0
+        self.trips = 0
+        self.opened_at: float | None = None
+        self.probe_started: float | None = None
+        self.last_error: str | None = None
+
+    @property
+    def cooldown(self) -> float:
+        return min(self.max_cooldown, self.base_cooldown * (2 ** max(0, self.trips - 1)))
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    @property
+    def probe_in_flight(self) -> bool:
+        return self.probe_started is not None and time.monotonic() - self.probe_started < self.probe_timeout
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self.probe_in_flight:
+            return False
+        # Half-open: this caller is the single probe; its result closes or re-opens the breaker
+        self.probe_started = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = None
+        self.probe_started = None
+        self.last_error = None
+
+    def record_failure(self, err: str) -> None:
+        self.last_error = err
+        self.probe_started = None
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.trips += 1
+            self.opened_at = time.monotonic()
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "cooldown_s": self.cooldown if self.opened_at is not None else 0.0,
+            "last_error": self.last_error,
+        }
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies (seconds)."""
+
+    def __init__(self, window: int = 50, min_samples: int = 10, default_hedge_after: float = 2.0):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.default_hedge_after = default_hedge_after
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def p95(self) -> float | None:
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def hedge_after(self) -> float:
+        p = self.p95()
+        return self.default_hedge_after if p is None else p
+
+
+async def hedged(make_call: Callable[[], Awaitable[T]], hedge_after: float) -> T:
+    """
+    Run make_call(); if it is still running after hedge_after seconds, start one duplicate
+    and return whichever succeeds first. A fast failure is raised as-is (no duplicate) so
+    errors reach the caller's breaker instead of doubling load on a failing upstream.
+    """
+    primary = asyncio.ensure_future(make_call())
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        tasks.add(asyncio.ensure_future(make_call()))
+        last_exc: BaseException | None = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_exc = task.exception()
+        assert last_exc is not None
+        raise last_exc
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Any
 
+from app.game_context import GameContext
+
 
 @dataclass
 class MemoryStore:
@@ -13,9 +15,26 @@ class MemoryStore:
     postgame_recap: str | None = None
 
     last_state: dict[str, Any] | None = None
+    # Rolling narrative fed to Gemini prompts; updated once per changed poll
+    context: GameContext = field(default_factory=GameContext)
 
     poll_count: int = 0
     last_update_iso: str | None = None
+    # Bumped on every mutation; served as the /api/state ETag so clients can send If-None-Match
+    version: int = 0
+
+    def reset(self) -> None:
+        """Forget the current game (demo reset, switching games). version keeps counting up."""
+        self.last_fingerprint = None
+        self.commentary.clear()
+        self.winprob_history.clear()
+        self.winprob_home = None
+        self.postgame_recap = None
+        self.context.reset()
+        self.last_state = None
+        self.poll_count = 0
+        self.last_update_iso = None
+        self.version += 1
 
 
 STORE = MemoryStore()
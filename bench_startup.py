@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time `import app.main` in fresh interpreters. Also fails if importing
+the app pulls in work that belongs in startup/warm-up (the Gemini SDK, the demo feed,
+hydration from runtime/state.json).
+
+Import time depends on the machine, so regressions are judged against a reference revision
+timed in the same run (--against, e.g. the PR's base branch); without it only a coarse
+absolute budget applies.
+
+  python bench_startup.py --against origin/main     # fail if >25% slower than main, same machine
+  python bench_startup.py                           # coarse absolute budget (--budget-ms)
+  python bench_startup.py --against HEAD~3 --runs 9 --tolerance 0.15
+"""
+import argparse
+import io
+import json
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Runs in a fresh interpreter so nothing is already imported or cached
+_PROBE = """
+import json, sys, time
+import app.persist
+# Count reads of runtime/state.json: hydration must wait for the startup hook
+load_calls = []
+_load_state = app.persist.load_state
+def _counting_load_state():
+    load_calls.append(1)
+    return _load_state()
+app.persist.load_state = _counting_load_state
+t0 = time.perf_counter()
+import app.main
+elapsed_ms = (time.perf_counter() - t0) * 1000
+import app.data_sources as ds
+print(json.dumps({
+    "import_ms": elapsed_ms,
+    "gemini_sdk_imported": "google.generativeai" in sys.modules,
+    "demo_feed_built": getattr(ds, "_demo", None) is not None,
+    "hydrated": bool(load_calls),
+}))
+"""
+
+
+def _probe(root: Path = PROJECT_ROOT) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _export_ref(ref: str, dest: Path) -> None:
+    """Check out the committed tree of ref into dest (without touching the working tree)."""
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", ref],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dest, filter="data")
+        else:
+            tar.extractall(dest)
+
+
+def _summary(label: str, times: list[float]) -> float:
+    median = statistics.median(times)
+    print(f"{label}: median {median:.0f} ms, min {min(times):.0f} ms, max {max(times):.0f} ms ({len(times)} runs)")
+    return median
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--against", metavar="REF", help="Git revision to time in the same run and compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression over --against (0.25 = 25%%)")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Absolute budget when --against is not given")
+    args = parser.parse_args()
+    runs = max(1, args.runs)
+
+    failures = []
+    if args.against:
+        with tempfile.TemporaryDirectory() as tmp:
+            ref_root = Path(tmp)
+            _export_ref(args.against, ref_root)
+            # Interleave so machine load drifts affect both trees alike
+            results, ref_times = [], []
+            for _ in range(runs):
+                results.append(_probe())
+                ref_times.append(_probe(ref_root)["import_ms"])
+        median = _summary("import app.main", [r["import_ms"] for r in results])
+        ref_median = _summary(f"import app.main @ {args.against}", ref_times)
+        budget = ref_median * (1 + args.tolerance)
+        print(f"budget {budget:.0f} ms (+{args.tolerance:.0%} over {args.against})")
+    else:
+        results = [_probe() for _ in range(runs)]
+        median = _summary("import app.main", [r["import_ms"] for r in results])
+        budget = args.budget_ms
+        print(f"budget {budget:.0f} ms (absolute; use --against REF for a same-machine comparison)")
+
+    if median > budget:
+        failures.append(f"median import time {median:.0f} ms exceeds budget {budget:.0f} ms")
+    first = results[0]
+    if first["gemini_sdk_imported"]:
+        failures.append("google.generativeai is imported at app import (should be lazy / warm-up)")
+    if first["demo_feed_built"]:
+        failures.append("demo feed is built at app import (should be lazy)")
+    if first["hydrated"]:
+        failures.append("runtime/state.json is loaded at app import (hydration belongs in startup)")
+
+    for f in failures:
+        print(f"FAIL: {f}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
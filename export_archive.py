@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Bulk export the post-game archive (every poll and Gemini call) to Parquet or Arrow IPC.
+
+  python export_archive.py --list
+  python export_archive.py --out exports/                          # all games, both tables
+  python export_archive.py --game 401547403 --table ai_calls --kind recap --out exports/
+  python export_archive.py --table polls --status live --quarter 4 --format arrow --out exports/
+
+Needs pyarrow: pip install -e ".[archive]"
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from app.archive import ArchiveUnavailable, TABLES, export, list_games
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--list", action="store_true", help="List archived games and exit")
+    parser.add_argument("--game", action="append", help="Game id to export (repeatable; default: all)")
+    parser.add_argument("--table", choices=TABLES, action="append", help="Table to export (default: all)")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--out", type=Path, default=Path("exports"))
+    parser.add_argument("--columns", nargs="+", help="Only these columns")
+    parser.add_argument("--status", help="polls: pregame | live | final")
+    parser.add_argument("--quarter", type=int, help="polls: quarter")
+    parser.add_argument("--kind", help="ai_calls: commentary | winprob | recap")
+    parser.add_argument("--since-poll", type=int, help="Only rows with poll >= N")
+    args = parser.parse_args()
+
+    games = list_games()
+    if args.list:
+        for g in games:
+            print(g)
+        return 0
+    if not games:
+        print("No archived games yet.")
+        return 1
+
+    suffix = ".parquet" if args.format == "parquet" else ".arrow"
+    name = "-".join(args.game) if args.game else "all"
+    try:
+        for table in args.table or TABLES:
+            if table == "ai_calls":
+                filters = {"kind": args.kind, "since_poll": args.since_poll}
+            else:
+                filters = {"status": args.status, "quarter": args.quarter, "since_poll": args.since_poll}
+            out = args.out / f"{name}-{table}{suffix}"
+            rows = export(table, out, args.format, args.game, args.columns, filters)
+            print(f"{table}: {rows} rows -> {out}")
+    except ArchiveUnavailable as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,81 +1,107 @@
 #!/usr/bin/env python3
 """
-Find the Super Bowl (or any NFL game) and its ESPN game ID.
-Use this to get ESPN_GAME_ID for .env when tracking the live Super Bowl.
+Find the Super Bowl (or any NFL game) and its ESPN game ID, and optionally write it to .env.
+
+  python find_super_bowl.py                          # list games, pick the Super Bowl
+  python find_super_bowl.py --match "Seahawks vs Patriots"
+  python find_super_bowl.py --start 2026-02-01 --end 2026-02-10 --write
+  python find_super_bowl.py --season-type 3 --weeks 1 2 3 4 5 --year 2025
 """
-import httpx
+import argparse
 import asyncio
-from datetime import datetime
-
-
-async def find_nfl_games():
-    """Fetch NFL scoreboard from ESPN (includes Super Bowl when in season)."""
-    url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-
-        events = data.get("events", [])
-
-        if not events:
-            print("No NFL games found. Try again during the season or Super Bowl Sunday.")
-            return
-
-        print(f"\n{'='*80}")
-        print(f"NFL Games — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{'='*80}\n")
-
-        for event in events:
-            game_id = event.get("id")
-            name = event.get("name", "Unknown")
-            short_name = event.get("shortName", "")
-            status = event.get("status", {})
-            status_type = status.get("type", {}).get("state", "pre")
-            status_detail = status.get("type", {}).get("detail", "Scheduled")
-
-            competitions = event.get("competitions", [{}])
-            comp = competitions[0] if competitions else {}
-            competitors = comp.get("competitors", [])
-
-            home = next((c for c in competitors if c.get("homeAway") == "home"), {})
-            away = next((c for c in competitors if c.get("homeAway") == "away"), {})
-
-            home_team = home.get("team", {}).get("displayName", "?")
-            away_team = away.get("team", {}).get("displayName", "?")
-            home_score = home.get("score", "0")
-            away_score = away.get("score", "0")
-
-            if status_type == "in":
-                status_icon = "🔴 LIVE"
-            elif status_type == "post":
-                status_icon = "✅ FINAL"
-            else:
-                status_icon = "⏰ SCHEDULED"
-
-            sb_tag = " 🏆 SUPER BOWL" if "super" in name.lower() or "super bowl" in short_name.lower() else ""
-            print(f"{status_icon}{sb_tag} {short_name or name}")
-            print(f"  Game ID: {game_id}")
-            print(f"  {away_team} @ {home_team}")
-            print(f"  Score: {away_score} - {home_score}")
-            print(f"  Status: {status_detail}")
-            if status_type == "in":
-                period = status.get("period")
-                clock = status.get("displayClock", "")
-                print(f"  Q{period} - {clock}")
-            print()
-
-        first_id = events[0].get("id")
-        print(f"To track this game, set in .env:")
-        print(f"  ESPN_GAME_ID={first_id}")
-        print(f"  DEMO_MODE=0")
-        print()
-
-    except Exception as e:
-        print(f"Error fetching NFL games: {e}")
+import sys
+from datetime import date, datetime
+
+from app.discovery import (
+    configure_tracker,
+    date_params,
+    default_queries,
+    discover,
+    select_game,
+    week_params,
+)
+
+
+def _print_game(game, selected: bool) -> None:
+    if game.state == "in":
+        status_icon = "🔴 LIVE"
+    elif game.state == "post":
+        status_icon = "✅ FINAL"
+    else:
+        status_icon = "⏰ SCHEDULED"
+
+    sb_tag = " 🏆 SUPER BOWL" if game.is_super_bowl else ""
+    pick = "  <== selected" if selected else ""
+    print(f"{status_icon}{sb_tag} {game.short_name or game.name}{pick}")
+    print(f"  Game ID: {game.id}")
+    print(f"  {game.away_team} @ {game.home_team}")
+    print(f"  Date: {game.date_iso}")
+    print(f"  Score: {game.away_score} - {game.home_score}")
+    print(f"  Status: {game.status_detail}")
+    if game.state == "in":
+        print(f"  Q{game.period} - {game.clock}")
+    print()
+
+
+async def find_nfl_games(args) -> int:
+    """Query ESPN scoreboards concurrently, list games, and select/configure one."""
+    queries = []
+    if args.start or args.end:
+        start = date.fromisoformat(args.start or args.end)
+        end = date.fromisoformat(args.end or args.start)
+        queries += date_params(start, end)
+    if args.season_type is not None:
+        queries += week_params(args.season_type, args.weeks or [1], args.year)
+    if not queries:
+        queries = default_queries()
+
+    index, errors = await discover(queries, use_cache=not args.no_cache)
+    for err in errors:
+        print(f"Error fetching NFL games: {err}")
+
+    if not len(index):
+        print("No NFL games found. Try again during the season or Super Bowl Sunday.")
+        return 1
+
+    game = select_game(index, args.match)
+
+    print(f"\n{'='*80}")
+    print(f"NFL Games — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ({len(index)} found)")
+    print(f"{'='*80}\n")
+    for g in index.all():
+        _print_game(g, selected=game is not None and g.id == game.id)
+
+    if game is None:
+        target = f"matching '{args.match}'" if args.match else "for the Super Bowl"
+        print(f"No game found {target}. Use --match or widen the date range.")
+        return 1
+
+    if args.write:
+        values = configure_tracker(game)
+        print("Wrote to .env:")
+        for k, v in values.items():
+            print(f"  {k}={v}")
+        print("Restart the server to track this game.")
+    else:
+        print(f"To track {game.short_name or game.name}, set in .env (or re-run with --write):")
+        for k, v in game.env_values().items():
+            print(f"  {k}={v}")
+    print()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", help="First date to scan (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date to scan (YYYY-MM-DD)")
+    parser.add_argument("--season-type", type=int, help="1 = preseason, 2 = regular, 3 = postseason")
+    parser.add_argument("--weeks", type=int, nargs="+", help="Weeks to scan with --season-type")
+    parser.add_argument("--year", type=int, help="Season year with --season-type")
+    parser.add_argument("--match", help='Matchup to select instead of the Super Bowl, e.g. "Seahawks vs Patriots"')
+    parser.add_argument("--write", action="store_true", help="Write the selected game to .env")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the on-disk response cache")
+    return asyncio.run(find_nfl_games(parser.parse_args()))
 
 
 if __name__ == "__main__":
-    asyncio.run(find_nfl_games())
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import pytest
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """TestClient on the demo-mode app with persistence and the archive pointed at tmp_path."""
+    from fastapi.testclient import TestClient
+
+    import app.main as main
+    from app.archive import ARCHIVE, TABLES
+    from app.config import settings
+    from app.data_sources import demo_set_index
+    from app.store import STORE
+
+    monkeypatch.setattr(settings, "demo_mode", True)
+    monkeypatch.setattr(settings, "warmup", False)
+    monkeypatch.setattr(main, "load_state", lambda: None)
+    monkeypatch.setattr(main, "save_state", lambda payload: None)
+    # Patch the shared instance: main, ai_engine and lifecycle all record through it
+    monkeypatch.setattr(ARCHIVE, "root", tmp_path / "archive")
+    monkeypatch.setattr(ARCHIVE, "_rows", {t: [] for t in TABLES})
+    monkeypatch.setattr(ARCHIVE, "_last_status", None)
+    monkeypatch.setattr(ARCHIVE, "_final_pending", False)
+    # Module-level state outlives each test; start every client from a fresh demo game
+    STORE.reset()
+    demo_set_index(0)
+    with TestClient(main.app) as c:
+        yield c
@@ -0,0 +1,58 @@
+import app.main as main
+from app.game_logic import GameState
+
+VOLATILE = {"poll_count", "last_update_iso", "demo_idx", "upstream"}
+
+
+def _fixed_feed(monkeypatch, state):
+    async def fetch_state():
+        return state
+
+    monkeypatch.setattr(main, "fetch_state", fetch_state)
+
+
+def test_state_etag_and_304(client):
+    r = client.get("/api/state")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert etag == f'"{r.json()["meta"]["version"]}"'
+    assert not VOLATILE & r.json()["meta"].keys()
+
+    r = client.get("/api/state", headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.headers["etag"] == etag and not r.content
+
+    before = client.get("/api/status").json()["poll_count"]
+    polled = client.post("/admin/poll").json()
+    assert polled["state"] and polled["meta"]["poll_count"] == before + 1
+    r = client.get("/api/state", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["etag"] == f'"{polled["meta"]["version"]}"'
+
+
+def test_idle_polls_keep_etag_but_update_status(client, monkeypatch):
+    _fixed_feed(monkeypatch, GameState("Patriots", "Seahawks", 7, 3, "live", 2, "05:00"))
+    client.post("/admin/poll")
+    etag = client.get("/api/state").headers["etag"]
+    first = client.get("/api/status").json()
+
+    client.post("/admin/poll")
+    assert client.get("/api/state", headers={"If-None-Match": etag}).status_code == 304
+    status = client.get("/api/status")
+    assert status.headers["cache-control"] == "no-store"
+    assert status.json()["poll_count"] == first["poll_count"] + 1
+    assert status.json()["version"] == first["version"]
+
+
+def test_clock_and_clear_change_etag(client, monkeypatch):
+    _fixed_feed(monkeypatch, GameState("Patriots", "Seahawks", 7, 3, "live", 2, "05:00"))
+    client.post("/admin/poll")
+    etag = client.get("/api/state").headers["etag"]
+
+    # Same fingerprint (no Gemini calls) but the clock moved: clients must see it
+    _fixed_feed(monkeypatch, GameState("Patriots", "Seahawks", 7, 3, "live", 2, "04:10"))
+    client.post("/admin/poll")
+    r = client.get("/api/state", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.json()["state"]["clock"] == "04:10"
+
+    etag = r.headers["etag"]
+    client.post("/admin/clear/commentary")
+    assert client.get("/api/state", headers={"If-None-Match": etag}).status_code == 200
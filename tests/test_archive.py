@@ -0,0 +1,123 @@
+import os
+import tempfile
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from app.archive import GameArchive, export, list_games, read_table  # noqa: E402
+
+
+def _state(quarter, status="live", home=0, away=0):
+    return {"home_team": "Patriots", "away_team": "Seahawks", "home_score": home, "away_score": away,
+            "status": status, "quarter": quarter, "clock": "10:00", "stale": False}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    arc = GameArchive(tmp_path / "archive")
+    for poll, quarter in enumerate([1, 2, 4, 4], start=1):
+        arc.record_poll(poll, _state(quarter, home=poll * 7), True, 0.5 + poll / 20, [f"play {poll}"])
+    arc.record_ai(3, "commentary", "prompt", "What a drive!", 12.5, 40, 9, 38)
+    arc.record_ai(4, "recap", "recap prompt", "Patriots win.", 80.0, None, None, 150)
+    arc.record_poll(5, _state(4, "final", home=35), True, 0.99, ["Final"])
+    assert arc.flush_due  # going final asks the caller to flush
+    arc.flush()
+    return arc
+
+
+def test_round_trip_with_filters(archive):
+    root = archive.root
+    assert list_games(root) == ["demo"]
+    polls = read_table("polls", root=root)
+    assert polls.num_rows == 5
+    assert polls.column("plays").to_pylist()[0] == ["play 1"]
+    q4 = read_table("polls", columns=["poll", "home_score"], filters={"quarter": 4, "status": "live"}, root=root)
+    assert q4.to_pydict() == {"poll": [3, 4], "home_score": [21, 28]}
+    recap = read_table("ai_calls", filters={"kind": "recap"}, root=root).to_pylist()
+    assert [r["response"] for r in recap] == ["Patriots win."] and recap[0]["prompt_tokens"] is None
+    assert read_table("ai_calls", filters={"since_poll": 4}, root=root).num_rows == 1
+
+
+def test_rotate_keeps_runs_apart(archive, monkeypatch):
+    first_run = archive.run_id
+    monkeypatch.setattr(archive, "run_id", "later")
+    archive.record_poll(1, _state(1), True, 0.5, [])
+    archive.rotate()
+    runs = read_table("polls", columns=["run_id"], root=archive.root).column("run_id").to_pylist()
+    assert runs.count(first_run) == 5 and runs.count("later") == 1
+
+
+def test_recording_never_writes_and_final_flushes_once(archive, monkeypatch):
+    segments = lambda: sorted((archive.root / "demo").glob("*.arrow"))  # noqa: E731
+    written = segments()
+    for poll in range(6, 16):
+        archive.record_poll(poll, _state(4, "final", home=35), False, 0.99, [])
+        assert not archive.flush_due
+    assert segments() == written
+
+    monkeypatch.setattr("app.archive.FLUSH_EVERY", 12)  # 10 repeat polls buffered
+    archive.record_poll(16, _state(4, "final", home=35), False, 0.99, [])
+    assert not archive.flush_due
+    archive.record_poll(17, _state(4, "final", home=35), False, 0.99, [])
+    assert archive.flush_due and segments() == written
+    archive.flush()
+    assert not archive.flush_due
+    assert read_table("polls", root=archive.root).num_rows == 17
+
+
+def test_workers_sharing_a_directory_do_not_collide(tmp_path):
+    workers = [GameArchive(tmp_path / "archive") for _ in range(3)]
+    assert len({w.run_id for w in workers}) == 3
+    for i, w in enumerate(workers):
+        w.record_poll(1, _state(1, home=i), True, 0.5, [])
+        w.flush()
+    assert sorted(read_table("polls", root=tmp_path / "archive").column("home_score").to_pylist()) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_export_formats(archive, tmp_path, fmt):
+    out = tmp_path / f"out.{fmt}"
+    rows = export("polls", out, fmt, ["demo"], ["poll", "status"], {"status": "final"}, archive.root)
+    assert rows == 1
+    if fmt == "parquet":
+        table = pq.read_table(out)
+    else:
+        with pa.ipc.open_file(out) as reader:
+            table = reader.read_all()
+    assert table.to_pydict() == {"poll": [5], "status": ["final"]}
+
+
+def test_export_endpoint_cleans_up(client, monkeypatch, tmp_path):
+    import app.main as main
+
+    tmp = tmp_path / "tmp"
+    tmp.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp))
+    for _ in range(3):
+        client.post("/admin/poll")
+    assert client.get("/api/archive").json()["games"] == ["demo"]
+
+    fds = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+    for fmt in ("parquet", "arrow"):
+        r = client.get("/api/archive/export", params={"fmt": fmt, "game": "demo"})
+        assert r.status_code == 200 and r.content
+    if fds is not None:
+        assert len(os.listdir("/proc/self/fd")) <= fds
+    assert list(tmp.iterdir()) == []
+
+    r = client.get("/api/archive/export", params={"table": "nope"})
+    assert r.status_code == 400 and list(tmp.iterdir()) == []
+    assert read_table("polls", root=main.ARCHIVE.root).num_rows == 3
+
+
+def test_finished_demo_writes_one_polls_segment(client):
+    import app.main as main
+
+    for _ in range(20):
+        client.post("/admin/poll")
+    assert client.get("/api/state").json()["state"]["status"] == "final"
+    # Final flushes once; repeat polls of the finished game stay buffered instead of one file each
+    assert len(list((main.ARCHIVE.root / "demo").glob("polls-*.arrow"))) == 1
@@ -0,0 +1,114 @@
+import asyncio
+
+import httpx
+import pytest
+
+import app.config as config
+import app.data_sources as ds
+import app.discovery as discovery
+from app.config import settings
+from app.discovery import GameIndex, _parse_event, configure_tracker, discover, select_game
+from app.game_logic import GameState
+from app.store import STORE
+
+
+def _event(game_id, home, away, headline="", state="post", date="2026-02-08T23:30Z"):
+    return {
+        "id": game_id,
+        "name": f"{away} at {home}",
+        "date": date,
+        "status": {"type": {"state": state}},
+        "competitions": [{
+            "competitors": [
+                {"homeAway": "home", "team": {"displayName": home}},
+                {"homeAway": "away", "team": {"displayName": away}},
+            ],
+            "notes": [{"headline": headline}] if headline else [],
+        }],
+    }
+
+
+def test_select_super_bowl_or_matchup():
+    index = GameIndex([
+        _parse_event(_event("1", "Buffalo Bills", "New York Jets"), {}),
+        _parse_event(_event("2", "New England Patriots", "Seattle Seahawks", "Super Bowl LX"), {}),
+    ])
+    assert select_game(index).id == "2"
+    assert select_game(index, "jets vs bills").id == "1"
+    assert select_game(index, "Seahawks").id == "2"
+    assert select_game(index, "Chiefs") is None
+    assert index.by_day("2026-02-08")[0].date_iso == "2026-02-08T23:30+00:00"
+
+
+@pytest.fixture
+def scoreboard(monkeypatch, tmp_path):
+    """Mock ESPN scoreboard; returns the list of request params seen."""
+    monkeypatch.setattr(discovery, "CACHE_DIR", tmp_path / "cache")
+    seen = []
+    pages = {"20260208": [_event("sb", "New England Patriots", "Seattle Seahawks", "Super Bowl LX")]}
+
+    def handler(request):
+        params = dict(request.url.params)
+        seen.append(params)
+        events = pages.get(params.get("dates"), [_event("cur", "Buffalo Bills", "New York Jets")])
+        return httpx.Response(200, json={"events": events})
+
+    def fetch(queries):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await discover(queries, client=client)
+            finally:
+                await client.aclose()
+
+        return asyncio.run(run())
+
+    return fetch, seen
+
+
+def test_discover_indexes_concurrent_pages(scoreboard):
+    fetch, seen = scoreboard
+    index, errors = fetch([{}, {"dates": "20260208"}])
+    assert not errors
+    assert sorted(g.id for g in index.all()) == ["cur", "sb"]
+    assert select_game(index).id == "sb"
+
+
+def test_only_date_pinned_final_pages_are_cached_forever(scoreboard, monkeypatch):
+    fetch, seen = scoreboard
+    queries = [{}, {"seasontype": 3, "week": 5}, {"dates": "20260208"}]
+    fetch(queries)
+    assert len(seen) == 3
+
+    # Past the TTL, only the page pinned by explicit dates is still served from cache
+    real_time = discovery.time.time
+    monkeypatch.setattr(discovery.time, "time", lambda: real_time() + discovery.CACHE_TTL_LIVE + 1)
+    fetch(queries)
+    assert [p for p in seen[3:]] == [{}, {"seasontype": "3", "week": "5"}]
+
+
+def test_configure_tracker_resets_previous_game(monkeypatch, tmp_path):
+    env = tmp_path / ".env"
+    env.write_text("GEMINI_API_KEY=abc\nDEMO_MODE=1\n", encoding="utf-8")
+    monkeypatch.setattr(config, "ENV_PATH", env)
+    for key in ("DEMO_MODE", "ESPN_GAME_ID", "HOME_TEAM", "AWAY_TEAM", "KICKOFF_ISO"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setattr(discovery.ARCHIVE, "rotate", lambda: None)
+    monkeypatch.setattr(ds, "_last_good", GameState("Old", "Game", 21, 3))
+    STORE.commentary.append("old game commentary")
+    STORE.last_fingerprint = "old"
+
+    game = _parse_event(_event("401", "New England Patriots", "Seattle Seahawks", "Super Bowl LX", "pre"), {})
+    try:
+        configure_tracker(game)
+        text = env.read_text(encoding="utf-8")
+        assert "GEMINI_API_KEY=abc" in text and "ESPN_GAME_ID=401" in text and "DEMO_MODE=0" in text
+        assert settings.espn_game_id == "401" and not settings.demo_mode
+        assert '"New England Patriots"' in text
+        assert ds._last_good is None
+        assert STORE.commentary == [] and STORE.last_fingerprint is None
+    finally:
+        for key in ("DEMO_MODE", "ESPN_GAME_ID", "HOME_TEAM", "AWAY_TEAM", "KICKOFF_ISO"):
+            monkeypatch.delenv(key, raising=False)
+        settings.reload()
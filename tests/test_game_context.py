@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+
+import app.ai_engine as ai
+from app.data_sources import DEMO_PATH
+from app.game_context import GameContext, build_prompt, estimate_tokens
+from app.game_logic import GameState, compute_win_prob_simple
+
+
+def _state(home_score, away_score, quarter=1, clock="10:00", status="live"):
+    return GameState("Patriots", "Seahawks", home_score, away_score, status, quarter, clock).to_dict()
+
+
+def test_update_tracks_plays_lead_changes_and_runs():
+    ctx = GameContext()
+    assert ctx.update(_state(0, 0)) == []
+    assert ctx.update(_state(0, 7)) == ["Q1 10:00: Seahawks TD (now Seahawks 7-Patriots 0)"]
+    ctx.update(_state(7, 7, 2))
+    ctx.update(_state(10, 7, 2))
+    ctx.update(_state(17, 7, 3))
+    assert ctx.lead_changes == 1
+    assert ctx.ties == 1
+    assert ctx.largest_lead == {"Seahawks": 7, "Patriots": 10}
+    assert (ctx.run_team, ctx.run_points) == ("Patriots", 17)
+    assert "take the lead" in ctx.key_plays[2]
+
+
+def test_multiple_scores_between_polls_make_one_play():
+    ctx = GameContext()
+    ctx.update(_state(17, 17, 4, "1:52"))
+    plays = ctx.update(_state(28, 24, 4, "0:00", "final"))
+    assert plays == ["Final: Patriots +11 (multiple scores), Seahawks TD (now Seahawks 24-Patriots 28)"]
+    # Order unknown when both teams scored, so no run is claimed
+    assert ctx.run_team is None
+
+
+def test_bookkeeping_fields_are_private_and_reset_clears_everything():
+    ctx = GameContext()
+    ctx.update(_state(0, 0), 0.5)
+    ctx.update(_state(0, 7), 0.3)
+    assert "_last_state" not in repr(ctx)
+    ctx.reset()
+    assert ctx == GameContext()
+    # After a reset the next poll is a fresh baseline again
+    assert ctx.update(_state(0, 7)) == []
+    assert ctx.update(_state(0, 14)) == ["Q1 10:00: Seahawks TD (now Seahawks 14-Patriots 0)"]
+
+
+def test_mid_game_join_uses_first_poll_as_baseline():
+    ctx = GameContext()
+    assert ctx.update(_state(21, 10, 3, "05:30"), 0.9) == []
+    assert ctx.key_plays == [] and ctx.largest_lead == {} and ctx.run_team is None
+    assert ctx.commentary_lines(_state(21, 10, 3, "05:30"))[1:] == []
+
+    plays = ctx.update(_state(21, 17, 3, "01:10"), 0.75)
+    assert plays == ["Q3 01:10: Seahawks TD (now Seahawks 17-Patriots 21)"]
+    assert ctx.lead_changes == 0 and ctx.largest_lead == {"Patriots": 4}
+    assert ctx.last_wp_swing == "Seahawks +15"
+
+
+def test_build_prompt_respects_budget_and_keeps_newest_plays():
+    lines = ["Score line", *[f"Play: play {i}" for i in range(20, 0, -1)]]
+    prompt = build_prompt("Instructions.", lines, "Answer:", 30)
+    assert estimate_tokens(prompt) <= 30
+    assert "play 20" in prompt and "play 1\n" not in prompt
+    assert prompt.index("play 19") < prompt.index("play 20")
+
+
+@pytest.fixture
+def demo_prompts(monkeypatch):
+    prompts = []
+    monkeypatch.setattr(ai, "_generate", lambda p, max_tokens=0, kind=None, poll=0: prompts.append((kind, p)) or "ok")
+    ctx = GameContext()
+    for e in json.loads(DEMO_PATH.read_text(encoding="utf-8")):
+        gs = GameState("Patriots", "Seahawks", e.get("home_score", 0), e.get("away_score", 0),
+                       e.get("status"), e.get("quarter"), e.get("clock"))
+        state, wp = gs.to_dict(), compute_win_prob_simple(gs)
+        ctx.update(state, wp)
+        asyncio.run(ai.ai_live_commentary({"state": state}, ctx))
+        asyncio.run(ai.ai_winprob_explain(state, wp, ctx))
+    asyncio.run(ai.ai_postgame_recap(state, [], [], ctx))
+    return prompts
+
+
+def test_demo_prompts_stay_within_budgets(demo_prompts):
+    budgets = {"commentary": ai.COMMENTARY_BUDGET, "winprob": ai.WINPROB_BUDGET, "recap": ai.RECAP_BUDGET}
+    for kind, prompt in demo_prompts:
+        assert estimate_tokens(prompt) <= budgets[kind], (kind, prompt)
+    recap = demo_prompts[-1][1]
+    assert "Lead changes: 1" in recap and recap.count("Play: ") == 5
+    last_winprob = [p for k, p in demo_prompts if k == "winprob"][-1]
+    assert "Swing: Patriots" in last_winprob
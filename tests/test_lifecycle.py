@@ -0,0 +1,26 @@
+from app.lifecycle import READINESS
+
+
+def test_healthz_always_ok(client):
+    r = client.get("/healthz")
+    assert r.status_code == 200
+    assert r.json() == {"ok": True}
+
+
+def test_readyz_reflects_readiness(client, monkeypatch):
+    assert client.get("/readyz").status_code == 200
+
+    monkeypatch.setattr(READINESS, "warmed_up", False)
+    r = client.get("/readyz")
+    assert r.status_code == 503
+    assert r.json()["ready"] is False
+
+
+def test_import_has_no_startup_side_effects():
+    from bench_startup import _probe
+
+    # Fresh interpreter: importing the app must not hydrate, build the demo feed or import the SDK
+    result = _probe()
+    assert result["hydrated"] is False
+    assert result["demo_feed_built"] is False
+    assert result["gemini_sdk_imported"] is False
@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+import pytest
+
+import app.data_sources as ds
+from app.config import settings
+from app.resilience import CircuitBreaker, LatencyTracker, hedged
+
+
+def test_breaker_opens_after_threshold_and_backs_off(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.resilience.time.monotonic", lambda: now[0])
+    b = CircuitBreaker(failure_threshold=3, base_cooldown=5.0)
+    for _ in range(2):
+        b.record_failure("boom")
+        assert b.allow()
+    b.record_failure("boom")
+    assert b.state == "open" and not b.allow()
+
+    now[0] += 5.0
+    assert b.state == "half_open"
+    assert b.allow()
+    b.record_failure("still down")
+    assert b.cooldown == 10.0 and not b.allow()
+
+    now[0] += 10.0
+    assert b.allow()
+    b.record_success()
+    assert b.state == "closed" and b.allow()
+
+
+def test_half_open_admits_single_probe(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("app.resilience.time.monotonic", lambda: now[0])
+    b = CircuitBreaker(failure_threshold=1, base_cooldown=5.0, probe_timeout=30.0)
+    b.record_failure("x")
+    now[0] += 5.0
+    assert b.allow() is True
+    assert b.allow() is False
+    assert b.allow() is False
+    # A probe that never reports back is abandoned after probe_timeout
+    now[0] += 30.0
+    assert b.allow() is True
+
+
+def test_latency_tracker_p95():
+    t = LatencyTracker(min_samples=10, default_hedge_after=2.0)
+    assert t.hedge_after() == 2.0
+    for i in range(1, 21):
+        t.record(i / 10)
+    assert t.p95() == pytest.approx(2.0)
+
+
+def test_hedged_duplicates_slow_call():
+    calls = []
+
+    async def call():
+        n = len(calls)
+        calls.append(n)
+        await asyncio.sleep(1.0 if n == 0 else 0.01)
+        return n
+
+    assert asyncio.run(hedged(call, 0.05)) == 1
+    assert len(calls) == 2
+
+
+def test_hedged_fast_failure_is_not_duplicated():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise ValueError("503")
+
+    with pytest.raises(ValueError):
+        asyncio.run(hedged(call, 0.5))
+    assert len(calls) == 1
+
+
+def _summary(home_score: int, away_score: int) -> dict:
+    return {
+        "header": {
+            "competitions": [{
+                "competitors": [
+                    {"homeAway": "home", "score": str(home_score), "team": {"displayName": "Patriots"}},
+                    {"homeAway": "away", "score": str(away_score), "team": {"displayName": "Seahawks"}},
+                ],
+                "status": {"type": {"state": "in"}, "period": 2, "displayClock": "5:00"},
+            }]
+        }
+    }
+
+
+@pytest.fixture
+def live_feed(monkeypatch):
+    """Live mode against a mock ESPN transport; returns the list of responses to serve."""
+    monkeypatch.setattr(settings, "demo_mode", False)
+    monkeypatch.setattr(settings, "espn_game_id", "401")
+    monkeypatch.setattr(ds, "_breaker", CircuitBreaker(failure_threshold=3))
+    monkeypatch.setattr(ds, "_latency", LatencyTracker())
+    monkeypatch.setattr(ds, "_last_good", None)
+    monkeypatch.setattr(ds, "_last_good_iso", None)
+    responses = []
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0) if responses else httpx.Response(503)
+
+    monkeypatch.setattr(ds, "_client", httpx.AsyncClient(base_url=ds.ESPN_BASE, transport=httpx.MockTransport(handler)))
+    return responses, requests
+
+
+def test_failures_serve_last_good_state_as_stale(live_feed):
+    responses, requests = live_feed
+    responses.append(httpx.Response(200, json=_summary(14, 7)))
+
+    async def run():
+        good = await ds.fetch_live_espn_state()
+        stale = [await ds.fetch_live_espn_state() for _ in range(5)]
+        return good, stale
+
+    good, stale = asyncio.run(run())
+    assert (good.home_score, good.away_score, good.stale) == (14, 7, False)
+    assert all(s.stale and (s.home_score, s.away_score) == (14, 7) for s in stale)
+    # 1 good + 3 failures trip the breaker; no duplicate requests for fast failures
+    assert len(requests) == 4
+    assert ds.upstream_status()["breaker"]["state"] == "open"